@@ -1,5 +1,5 @@
 import os
-from setuptools import setup
+from setuptools import setup, find_packages
 
 def read(filename):
     return open(os.path.join(os.path.dirname(__file__), filename)).read()
@@ -16,7 +16,7 @@ setup(
     author_email='ibluefocus@gmail.com',
     url='https://github.com/galeo/django-tenant-utils',
 
-    packages=['tenant_utils'],
+    packages=find_packages(exclude=['tests', 'tests.*']),
     include_package_data=True,
     install_requires=[
         'Django >= 2.1,<3.1'
@@ -10,6 +10,9 @@ from django.core.exceptions import ImproperlyConfigured
 from django.utils.crypto import constant_time_compare
 
 
+default_app_config = 'tenant_utils.apps.TenantUtilsConfig'
+
+
 def get_tenant_user_model():
     """
     Return the Organization User model that is active in this project.
@@ -1,5 +1,37 @@
 from django.apps import AppConfig
+from django.db.models.signals import (
+    pre_save, post_save, pre_delete, post_delete, post_migrate
+)
 
 
 class TenantUtilsConfig(AppConfig):
     name = 'tenant_utils'
+
+    def ready(self):
+        from django.contrib.auth.models import Group
+        from django_tenants.utils import get_tenant_model, get_tenant_domain_model
+
+        from .cache import domain_pre_save, domain_changed, tenant_changed
+        from .roles import clear_role_cache
+
+        # Keep the hostname to tenant cache in sync with the domain and tenant rows
+        DomainModel = get_tenant_domain_model()
+        TenantModel = get_tenant_model()
+        pre_save.connect(domain_pre_save, sender=DomainModel,
+                         dispatch_uid='tenant_utils_domain_pre_save')
+        post_save.connect(domain_changed, sender=DomainModel,
+                          dispatch_uid='tenant_utils_domain_saved')
+        post_delete.connect(domain_changed, sender=DomainModel,
+                            dispatch_uid='tenant_utils_domain_deleted')
+        post_save.connect(tenant_changed, sender=TenantModel,
+                          dispatch_uid='tenant_utils_tenant_saved')
+        pre_delete.connect(tenant_changed, sender=TenantModel,
+                           dispatch_uid='tenant_utils_tenant_deleted')
+
+        # Forget the group and permission ids resolved for role templates
+        post_save.connect(clear_role_cache, sender=Group,
+                          dispatch_uid='tenant_utils_group_saved')
+        post_delete.connect(clear_role_cache, sender=Group,
+                            dispatch_uid='tenant_utils_group_deleted')
+        post_migrate.connect(clear_role_cache,
+                             dispatch_uid='tenant_utils_role_post_migrate')
@@ -0,0 +1,254 @@
+"""Defines archiving of retired tenant schemas to disk and restoring them."""
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core import serializers
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from django_tenants.utils import (
+    get_public_schema_name,
+    get_tenant_model,
+    get_tenant_domain_model,
+    schema_context
+)
+
+from .exceptions import ArchiveError
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def get_tenant_archive_compression():
+    return getattr(settings, 'TENANT_ARCHIVE_COMPRESSION', 6)
+
+
+def get_retired_tenants():
+    """
+    Return the tenants marked as retired by `TenantBase.delete_tenant`.
+    """
+    return get_tenant_model().objects.filter(
+        retired__isnull=False
+    ).exclude(schema_name=get_public_schema_name())
+
+
+def get_legacy_retired_tenants():
+    """
+    Return the tenants retired before `TenantBase.retired` existed, which are
+    only recognizable by being owned by the public tenant owner.
+
+    Tenants the public owner created for itself match as well, review them
+    before marking them with `mark_retired`.
+    """
+    public_tenant = get_tenant_model().objects.get(schema_name=get_public_schema_name())
+    return get_tenant_model().objects.filter(
+        retired__isnull=True, owner_id=public_tenant.owner_id
+    ).exclude(schema_name=get_public_schema_name())
+
+
+def mark_retired(tenants):
+    """
+    Mark the tenants as retired now, returns the number of updated tenants.
+    """
+    return tenants.update(retired=timezone.now())
+
+
+def _get_archive_paths(output_dir, schema_name):
+    base = os.path.join(output_dir, schema_name)
+    return base + '.dump', base + '.json'
+
+
+def _get_pg_command(command, using):
+    """
+    Return the arguments and environment to run a postgres client tool
+    against the database `using`.
+    """
+    db = settings.DATABASES[using]
+    args = [command, '--dbname', db['NAME']]
+    if db.get('USER'):
+        args += ['--username', db['USER']]
+    if db.get('HOST'):
+        args += ['--host', db['HOST']]
+    if db.get('PORT'):
+        args += ['--port', str(db['PORT'])]
+    env = os.environ.copy()
+    if db.get('PASSWORD'):
+        env['PGPASSWORD'] = db['PASSWORD']
+    return args, env
+
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _serialize_tenant_rows(tenant):
+    """
+    Serialize the public schema rows that are deleted with the tenant.
+    """
+    TenantModel = tenant.__class__
+    through = TenantModel.users.through
+    objects = [tenant]
+    objects += list(get_tenant_domain_model().objects.filter(tenant_id=tenant.pk))
+    objects += list(through._default_manager.filter(
+        **{TenantModel.users.field.m2m_field_name(): tenant}))
+    return serializers.serialize('json', objects)
+
+
+def dump_schema(schema_name, dump_path, using=DEFAULT_DB_ALIAS):
+    """
+    Stream the schema into a compressed `pg_dump` archive, return its checksum.
+    """
+    args, env = _get_pg_command('pg_dump', using)
+    args += ['--format', 'custom',
+             '--compress', str(get_tenant_archive_compression()),
+             '--schema', schema_name]
+    digest = hashlib.sha256()
+    with open(dump_path, 'wb') as f, tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(args, env=env, stdout=subprocess.PIPE,
+                                   stderr=stderr)
+        for chunk in iter(lambda: process.stdout.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            f.write(chunk)
+        if process.wait() != 0:
+            stderr.seek(0)
+            raise ArchiveError("pg_dump of schema {} failed: {}".format(
+                schema_name, stderr.read().decode(errors='replace')))
+    return digest.hexdigest()
+
+
+def verify_archive(dump_path, checksum):
+    """
+    Check the archive on disk matches its checksum and can be read by pg_restore.
+    """
+    if _checksum(dump_path) != checksum:
+        raise ArchiveError("Checksum mismatch for archive {}".format(dump_path))
+
+    result = subprocess.run(['pg_restore', '--list', dump_path],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise ArchiveError("Archive {} is not readable: {}".format(
+            dump_path, result.stderr.decode(errors='replace')))
+
+
+def archive_tenant(tenant, output_dir, using=DEFAULT_DB_ALIAS):
+    """
+    Archive the schema of a retired tenant to `output_dir`, verify the
+    archive and then drop the schema together with the tenant rows.
+    """
+    schema_name = tenant.schema_name
+    if schema_name == get_public_schema_name():
+        raise ArchiveError("Cannot archive public tenant schema")
+    if tenant.retired is None:
+        raise ArchiveError("Tenant {} is not retired".format(schema_name))
+
+    dump_path, metadata_path = _get_archive_paths(output_dir, schema_name)
+    if os.path.exists(metadata_path):
+        raise ArchiveError("Archive of schema {} already exists".format(schema_name))
+
+    try:
+        checksum = dump_schema(schema_name, dump_path, using)
+        verify_archive(dump_path, checksum)
+    except Exception:
+        if os.path.exists(dump_path):
+            os.remove(dump_path)
+        raise
+
+    try:
+        metadata = {
+            'schema_name': schema_name,
+            'archived': timezone.now().isoformat(),
+            'checksum': checksum,
+            'rows': _serialize_tenant_rows(tenant),
+        }
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f)
+
+        with schema_context(get_public_schema_name()):
+            with transaction.atomic(using=using):
+                # Flag is set to drop the schema with the tenant
+                tenant.delete(force_drop=True)
+    except Exception:
+        # Nothing was dropped, an archive left behind would block a retry
+        for path in (metadata_path, dump_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+
+def _archive_tenant_in_thread(tenant, output_dir, using):
+    try:
+        archive_tenant(tenant, output_dir, using)
+    finally:
+        # Every thread opens its own connection
+        connections[using].close()
+
+
+def archive_tenants(tenants, output_dir, workers=4, using=DEFAULT_DB_ALIAS):
+    """
+    Archive the tenants with at most `workers` running in parallel.
+
+    A failure doesn't stop the other tenants, returns a list of
+    `(schema_name, error)` where error is None when the tenant was archived.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(tenant.schema_name,
+                    executor.submit(_archive_tenant_in_thread, tenant, output_dir, using))
+                   for tenant in tenants]
+    results = []
+    for schema_name, future in futures:
+        results.append((schema_name, future.exception()))
+    return results
+
+
+def restore_tenant(schema_name, output_dir, using=DEFAULT_DB_ALIAS):
+    """
+    Restore an archived schema and the tenant rows dropped with it.
+
+    The `retired` marker of the restored tenant is cleared, so it isn't
+    archived again until `TenantBase.delete_tenant` retires it once more.
+    """
+    dump_path, metadata_path = _get_archive_paths(output_dir, schema_name)
+    if not os.path.exists(metadata_path):
+        raise ArchiveError("No archive of schema {} found".format(schema_name))
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    verify_archive(dump_path, metadata['checksum'])
+
+    args, env = _get_pg_command('pg_restore', using)
+    result = subprocess.run(args + ['--exit-on-error', dump_path], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise ArchiveError("pg_restore of schema {} failed: {}".format(
+            schema_name, result.stderr.decode(errors='replace')))
+
+    TenantModel = get_tenant_model()
+    try:
+        with schema_context(get_public_schema_name()):
+            with transaction.atomic(using=using):
+                # Raw saves, so the tenant doesn't try to create its schema again
+                for obj in serializers.deserialize('json', metadata['rows'],
+                                                   using=using):
+                    if isinstance(obj.object, TenantModel):
+                        obj.object.retired = None
+                    obj.save(using=using)
+    except Exception:
+        # Without its tenant rows the schema is unreachable and would block
+        # another restore
+        with connections[using].cursor() as cursor:
+            cursor.execute('DROP SCHEMA IF EXISTS {} CASCADE'.format(
+                connections[using].ops.quote_name(schema_name)))
+        raise
+
+    os.remove(metadata_path)
+    os.remove(dump_path)
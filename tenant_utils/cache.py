@@ -0,0 +1,182 @@
+"""Defines the hostname to tenant cache used by the tenant middleware."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from django_tenants.utils import get_tenant_domain_model
+
+
+# Stored for hostnames that don't belong to any tenant
+NOT_FOUND = '__tenant_not_found__'
+
+
+def get_tenant_cache_alias():
+    return getattr(settings, 'TENANT_CACHE_ALIAS', 'default')
+
+
+def get_tenant_cache_timeout():
+    return getattr(settings, 'TENANT_CACHE_TIMEOUT', 300)
+
+
+def get_tenant_cache_negative_timeout():
+    return getattr(settings, 'TENANT_CACHE_NEGATIVE_TIMEOUT', 60)
+
+
+def get_tenant_local_cache_size():
+    return getattr(settings, 'TENANT_LOCAL_CACHE_SIZE', 1024)
+
+
+def get_tenant_local_cache_timeout():
+    return getattr(settings, 'TENANT_LOCAL_CACHE_TIMEOUT', 10)
+
+
+class LocalLRUCache(object):
+    """
+    A bounded, thread safe LRU cache local to the process.
+
+    Entries also expire after `timeout` seconds. Invalidations only reach the
+    current process, so the timeout bounds how long other processes may keep
+    serving a stale entry.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TenantHostnameCache(object):
+    """
+    Two level cache from hostname to tenant.
+
+    Lookups hit the process local LRU first, then the shared django cache and
+    only then the database. Hostnames without a tenant are cached as well so
+    unknown hosts don't reach the database on every request.
+    """
+    key_prefix = 'tenant_utils.hostname:'
+
+    def __init__(self):
+        self.local = LocalLRUCache(get_tenant_local_cache_size(),
+                                   get_tenant_local_cache_timeout())
+
+    @property
+    def shared(self):
+        return caches[get_tenant_cache_alias()]
+
+    def make_key(self, hostname):
+        return self.key_prefix + hostname
+
+    def get_tenant(self, domain_model, hostname):
+        """
+        Return the tenant of the hostname or raise `domain_model.DoesNotExist`.
+        """
+        key = self.make_key(hostname)
+        tenant = self.local.get(key)
+        if tenant is None:
+            tenant = self.shared.get(key)
+            if tenant is None:
+                tenant = self._get_tenant_from_db(domain_model, hostname)
+                timeout = get_tenant_cache_timeout()
+                if tenant == NOT_FOUND:
+                    timeout = get_tenant_cache_negative_timeout()
+                self.shared.set(key, tenant, timeout)
+            self.local.set(key, tenant)
+
+        if tenant == NOT_FOUND:
+            raise domain_model.DoesNotExist(
+                "No tenant found for hostname: {}".format(hostname))
+        # The middleware sets request specific attributes on the tenant
+        return self._copy_tenant(tenant)
+
+    def _copy_tenant(self, tenant):
+        """
+        Return a copy of the cached tenant that shares no state with it.
+
+        A shallow copy would share `_state` and thus the cache of loaded
+        relations, e.g. `request.tenant.owner`, between requests and threads.
+        """
+        clone = copy.copy(tenant)
+        clone._state = copy.copy(tenant._state)
+        clone._state.fields_cache = {}
+        clone.__dict__.pop('_prefetched_objects_cache', None)
+        return clone
+
+    def _get_tenant_from_db(self, domain_model, hostname):
+        try:
+            domain = domain_model.objects.select_related('tenant').get(domain=hostname)
+        except domain_model.DoesNotExist:
+            return NOT_FOUND
+        return domain.tenant
+
+    def _delete(self, keys):
+        for key in keys:
+            self.local.delete(key)
+        self.shared.delete_many(keys)
+
+    def invalidate(self, *hostnames):
+        keys = [self.make_key(hostname) for hostname in hostnames if hostname]
+        if not keys:
+            return
+        self._delete(keys)
+        # Requests running before the commit may have cached the old rows again
+        transaction.on_commit(lambda: self._delete(keys))
+
+    def invalidate_tenant(self, tenant):
+        hostnames = get_tenant_domain_model().objects.filter(
+            tenant_id=tenant.pk).values_list('domain', flat=True)
+        self.invalidate(*hostnames)
+
+
+tenant_hostname_cache = TenantHostnameCache()
+
+
+def domain_pre_save(sender, instance, **kwargs):
+    # The hostname of an existing domain may change, drop the old one as well
+    if instance.pk:
+        old_domain = sender._default_manager.filter(
+            pk=instance.pk).values_list('domain', flat=True).first()
+        if old_domain and old_domain != instance.domain:
+            tenant_hostname_cache.invalidate(old_domain)
+
+
+def domain_changed(sender, instance, **kwargs):
+    tenant_hostname_cache.invalidate(instance.domain)
+
+
+def tenant_changed(sender, instance, **kwargs):
+    tenant_hostname_cache.invalidate_tenant(instance)
@@ -12,3 +12,11 @@ class DeleteError(Exception):
 
 class SchemaError(Exception):
     pass
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class RoleDoesNotExist(LookupError):
+    pass
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import (
+    archive_tenants,
+    get_legacy_retired_tenants,
+    get_retired_tenants,
+    mark_retired
+)
+
+
+class Command(BaseCommand):
+    help = ("Archive the schemas of retired tenants to compressed dumps, "
+            "then drop the schemas and the tenants.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir',
+                            help='Directory the archives are written to.')
+        parser.add_argument('--schema', action='append', dest='schema_names',
+                            help='Only archive the retired tenant with this schema. '
+                                 'Can be given multiple times.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of tenants archived in parallel.')
+        parser.add_argument('--dry-run', action='store_true', dest='dry_run',
+                            help='Only list the tenants that would be archived.')
+        parser.add_argument('--mark-legacy', action='store_true', dest='mark_legacy',
+                            help='Instead of archiving, mark the tenants retired before '
+                                 'the retired field existed, i.e. owned by the public '
+                                 'tenant owner, as retired. Review the list, tenants '
+                                 'the public owner created for itself match as well.')
+        parser.add_argument('--noinput', '--no-input', action='store_false',
+                            dest='interactive',
+                            help='Do not ask for confirmation before dropping schemas '
+                                 'or marking tenants.')
+
+    def handle(self, *args, **options):
+        if options['mark_legacy']:
+            return self.mark_legacy(**options)
+
+        tenants = get_retired_tenants()
+        if options['schema_names']:
+            tenants = tenants.filter(schema_name__in=options['schema_names'])
+        tenants = list(tenants)
+
+        if not tenants:
+            self.stdout.write("No retired tenants to archive.")
+            return
+
+        for tenant in tenants:
+            self.stdout.write("{} (retired {})".format(tenant.schema_name, tenant.retired))
+        if options['dry_run']:
+            return
+
+        if options['interactive']:
+            answer = input("The schemas of these {} tenants will be dropped after "
+                           "archiving. Type 'yes' to continue: ".format(len(tenants)))
+            if answer != 'yes':
+                raise CommandError("Archiving cancelled.")
+
+        failed = 0
+        results = archive_tenants(tenants, options['output_dir'],
+                                  workers=max(options['workers'], 1))
+        for schema_name, error in results:
+            if error is None:
+                self.stdout.write("Archived schema {}".format(schema_name))
+            else:
+                failed += 1
+                self.stderr.write("Failed to archive schema {}: {}".format(
+                    schema_name, error))
+
+        if failed:
+            raise CommandError("{} of {} tenants could not be archived.".format(
+                failed, len(results)))
+
+    def mark_legacy(self, **options):
+        tenants = get_legacy_retired_tenants()
+        if options['schema_names']:
+            tenants = tenants.filter(schema_name__in=options['schema_names'])
+
+        schema_names = list(tenants.values_list('schema_name', flat=True))
+        if not schema_names:
+            self.stdout.write("No legacy retired tenants to mark.")
+            return
+
+        for schema_name in schema_names:
+            self.stdout.write(schema_name)
+        if options['dry_run']:
+            return
+
+        if options['interactive']:
+            answer = input("These {} tenants will be marked as retired and archived "
+                           "by the next run. Type 'yes' to continue: ".format(
+                               len(schema_names)))
+            if answer != 'yes':
+                raise CommandError("Marking cancelled.")
+
+        marked = mark_retired(tenants.filter(schema_name__in=schema_names))
+        self.stdout.write("Marked {} tenants as retired.".format(marked))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import restore_tenant
+from ...exceptions import ArchiveError
+
+
+class Command(BaseCommand):
+    help = ("Restore a tenant schema archived by archive_tenants. The tenant's "
+            "retired marker is cleared, so archive_tenants keeps it until it is "
+            "deleted again.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('schema_name', help='Schema of the archived tenant.')
+        parser.add_argument('output_dir',
+                            help='Directory the archive was written to.')
+
+    def handle(self, *args, **options):
+        try:
+            restore_tenant(options['schema_name'], options['output_dir'])
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        self.stdout.write("Restored schema {}".format(options['schema_name']))
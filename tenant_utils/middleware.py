@@ -1,11 +1,15 @@
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 
+from django_tenants.middleware.main import TenantMainMiddleware
 from django_tenants.utils import get_public_schema_name
 
 from . import get_tenant_user
+from .cache import tenant_hostname_cache
+from .routers import unpin
 
 
 def get_user(request):
@@ -26,3 +30,25 @@ class TenantAuthenticationMiddleware(AuthenticationMiddleware):
             "'TenantAuthenticationMiddleware'."
         ) % ("_CLASSES" if settings.MIDDLEWARE is None else "")
         request.user = SimpleLazyObject(lambda: get_user(request))
+
+
+class CachedTenantMainMiddleware(TenantMainMiddleware):
+    """
+    Resolves the tenant like `TenantMainMiddleware` and sets `request.tenant` and
+    the connection schema, but looks the hostname up in the tenant hostname cache
+    before hitting the domain table.
+    """
+    def get_tenant(self, domain_model, hostname):
+        return tenant_hostname_cache.get_tenant(domain_model, hostname)
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Resets the primary pinning of `TenantReplicaRouter` around every request.
+    """
+    def process_request(self, request):
+        unpin()
+
+    def process_response(self, request, response):
+        unpin()
+        return response
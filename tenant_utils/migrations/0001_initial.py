@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantSession',
+            fields=[
+                ('session_key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='session key')),
+                ('session_data', models.TextField(verbose_name='session data')),
+                ('expire_date', models.DateTimeField(db_index=True, verbose_name='expire date')),
+                ('tenant_schema', models.CharField(max_length=63, verbose_name='tenant schema')),
+                ('user_id', models.CharField(blank=True, max_length=255, verbose_name='user id')),
+            ],
+            options={
+                'verbose_name': 'session',
+                'verbose_name_plural': 'sessions',
+                'db_table': 'tenant_utils_session',
+                'abstract': False,
+                'index_together': {('tenant_schema', 'user_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.contrib.sessions.base_session import AbstractBaseSession
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class TenantSession(AbstractBaseSession):
+    """
+    Session stored together with the schema of the tenant it belongs to and
+    the id of the logged in user, so sessions can be expired per tenant or user.
+    """
+    tenant_schema = models.CharField(_('tenant schema'), max_length=63)
+    user_id = models.CharField(_('user id'), max_length=255, blank=True)
+
+    @classmethod
+    def get_session_store_class(cls):
+        from .sessions import SessionStore
+        return SessionStore
+
+    class Meta(AbstractBaseSession.Meta):
+        db_table = 'tenant_utils_session'
+        index_together = [('tenant_schema', 'user_id')]
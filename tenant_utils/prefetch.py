@@ -0,0 +1,107 @@
+"""Defines batch loading of related users across the tenant and public schemas."""
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models.query import ModelIterable
+
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from . import get_tenant_user_model
+
+
+def prefetch_supervisors(tenant_users):
+    """
+    Load the public supervisors of the given tenant users with one query
+    against the public schema and attach them to the `supervisor` field.
+    """
+    tenant_users = list(tenant_users)
+    if not tenant_users:
+        return tenant_users
+
+    supervisor_field = get_tenant_user_model()._meta.get_field('supervisor')
+    supervisor_ids = {user.supervisor_id for user in tenant_users
+                      if user.supervisor_id is not None}
+    supervisors = {}
+    if supervisor_ids:
+        with schema_context(get_public_schema_name()):
+            supervisors = get_user_model()._default_manager.in_bulk(supervisor_ids)
+
+    for user in tenant_users:
+        supervisor_field.set_cached_value(user, supervisors.get(user.supervisor_id))
+    return tenant_users
+
+
+def prefetch_tenant_users(public_users, to_attr='tenant_user'):
+    """
+    Load the tenant users of the current schema supervised by the given public
+    users with one query and attach them as `to_attr`, None when not linked.
+    """
+    public_users = list(public_users)
+    if not public_users:
+        return public_users
+
+    TenantUserModel = get_tenant_user_model()
+    supervisor_field = TenantUserModel._meta.get_field('supervisor')
+    tenant_users = {}
+    for tenant_user in TenantUserModel._default_manager.filter(
+            supervisor_id__in={user.pk for user in public_users}):
+        tenant_users[tenant_user.supervisor_id] = tenant_user
+
+    for user in public_users:
+        tenant_user = tenant_users.get(user.pk)
+        if tenant_user is not None:
+            supervisor_field.set_cached_value(tenant_user, user)
+        setattr(user, to_attr, tenant_user)
+    return public_users
+
+
+class CrossSchemaPrefetchQuerySet(models.QuerySet):
+    """
+    QuerySet running the cross schema prefetch functions once its results
+    are fetched, `prefetch_related` can't follow relations across schemas.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cross_schema_prefetch = ()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cross_schema_prefetch = self._cross_schema_prefetch
+        return clone
+
+    def _add_cross_schema_prefetch(self, func, **kwargs):
+        clone = self._chain()
+        clone._cross_schema_prefetch += ((func, kwargs),)
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if not fetched and self._iterable_class is ModelIterable:
+            for func, kwargs in self._cross_schema_prefetch:
+                func(self._result_cache, **kwargs)
+
+
+class TenantUserQuerySet(CrossSchemaPrefetchQuerySet):
+    """
+    QuerySet for the tenant user model, it isn't attached to any manager of
+    this package. Build the manager of your tenant user model from it, e.g.::
+
+        class TenantUser(AbstractBaseUser, PermissionsMixin):
+            ...
+            objects = BaseUserManager.from_queryset(TenantUserQuerySet)()
+
+        TenantUser.objects.prefetch_supervisors()
+    """
+
+    def prefetch_supervisors(self):
+        return self._add_cross_schema_prefetch(prefetch_supervisors)
+
+
+class PublicUserQuerySet(CrossSchemaPrefetchQuerySet):
+    """
+    QuerySet for the public user model, used by `tenant_utils.users.UserManager`.
+    """
+
+    def prefetch_tenant_users(self, to_attr='tenant_user'):
+        return self._add_cross_schema_prefetch(prefetch_tenant_users, to_attr=to_attr)
@@ -0,0 +1,167 @@
+"""Defines queries running over the tenant user tables of many schemas at once."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_tenants.utils import get_public_schema_name, get_tenant_model
+
+from . import get_tenant_user_model
+
+
+FETCH_SIZE = 2000
+
+
+def get_cross_schema_chunk_size():
+    return getattr(settings, 'TENANT_CROSS_SCHEMA_CHUNK_SIZE', 500)
+
+
+def get_tenant_schema_names():
+    """
+    Return the schema names of all tenants except the public tenant.
+    """
+    return list(get_tenant_model().objects.exclude(
+        schema_name=get_public_schema_name()
+    ).order_by('schema_name').values_list('schema_name', flat=True))
+
+
+def _build_where(opts, connection, filters):
+    clauses = []
+    params = []
+    for name, value in sorted((filters or {}).items()):
+        field = opts.get_field(name)
+        column = connection.ops.quote_name(field.column)
+        if value is None:
+            clauses.append('{} IS NULL'.format(column))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            clauses.append('{} = ANY(%s)'.format(column))
+            params.append([field.get_db_prep_value(item, connection) for item in value])
+        else:
+            clauses.append('{} = %s'.format(column))
+            params.append(field.get_db_prep_value(value, connection))
+    return ' AND '.join(clauses), params
+
+
+def build_union_query(schema_names, fields=None, filters=None, count=False,
+                      model=None, using=DEFAULT_DB_ALIAS):
+    """
+    Build one `UNION ALL` query over the table of `model` in every schema.
+
+    Every row starts with the schema name followed by the columns of `fields`
+    (defaults to the primary key), or by the number of matching rows when
+    `count` is set. `filters` maps field names to values, None matches NULL
+    and lists match any of their items.
+
+    Returns the sql and its params.
+    """
+    model = model or get_tenant_user_model()
+    opts = model._meta
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+
+    if count:
+        columns = 'COUNT(*)'
+    else:
+        columns = ', '.join(quote_name(opts.get_field(name).column)
+                            for name in (fields or [opts.pk.name]))
+    where, where_params = _build_where(opts, connection, filters)
+    if where:
+        where = ' WHERE ' + where
+
+    parts = []
+    params = []
+    for schema_name in schema_names:
+        parts.append('(SELECT %s::text, {} FROM {}.{}{})'.format(
+            columns, quote_name(schema_name), quote_name(opts.db_table), where))
+        params.append(schema_name)
+        params.extend(where_params)
+    return ' UNION ALL '.join(parts), params
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _iter_chunk(schema_names, using, **options):
+    sql, params = build_union_query(schema_names, using=using, **options)
+    connection = connections[using]
+    # A server side cursor, so fetchmany() streams the rows from the server,
+    # unless they're disabled for transaction pooling e.g. with pgbouncer
+    if connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        cursor = connection.cursor()
+    else:
+        cursor = connection.chunked_cursor()
+    with cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchmany(FETCH_SIZE)
+        while rows:
+            yield from rows
+            rows = cursor.fetchmany(FETCH_SIZE)
+
+
+def _fetch_chunk_in_thread(schema_names, using, **options):
+    try:
+        return list(_iter_chunk(schema_names, using, **options))
+    finally:
+        # Every thread opens its own connection
+        connections[using].close()
+
+
+def iter_cross_schema_rows(fields=None, filters=None, count=False, schema_names=None,
+                           chunk_size=None, workers=1, model=None,
+                           using=DEFAULT_DB_ALIAS):
+    """
+    Yield the rows of `build_union_query` for all tenant schemas.
+
+    The schemas are queried in chunks of `chunk_size`, one query per chunk,
+    and the rows are streamed from a server side cursor unless the database
+    sets `DISABLE_SERVER_SIDE_CURSORS`. With more than one
+    worker the chunks run in parallel on separate connections and at most
+    `workers` chunks are in flight. Each of them is buffered in memory until
+    its rows are yielded, still in the order of the chunks.
+
+    e.g. the active tenant users per tenant::
+
+        for schema_name, total in iter_cross_schema_rows(
+                filters={'is_active': True}, count=True):
+            ...
+    """
+    if schema_names is None:
+        schema_names = get_tenant_schema_names()
+    schema_names = list(schema_names)
+    chunks = _chunks(schema_names, chunk_size or get_cross_schema_chunk_size())
+    options = dict(fields=fields, filters=filters, count=count, model=model)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _iter_chunk(chunk, using, **options)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = deque()
+        for chunk in chunks:
+            if len(futures) >= workers:
+                yield from futures.popleft().result()
+            futures.append(executor.submit(_fetch_chunk_in_thread, chunk, using, **options))
+        while futures:
+            yield from futures.popleft().result()
+
+
+def count_tenant_users(schema_names=None, **filters):
+    """
+    Return a mapping of schema name to the number of tenant users matching
+    `filters`, e.g. `count_tenant_users(is_superuser=True)`.
+    """
+    return dict(iter_cross_schema_rows(filters=filters, count=True,
+                                       schema_names=schema_names))
+
+
+def find_supervised_tenant_users(user_obj, schema_names=None):
+    """
+    Yield `(schema_name, tenant_user_pk)` for each tenant user linked to the
+    public user.
+    """
+    return iter_cross_schema_rows(filters={'supervisor': user_obj.pk},
+                                  schema_names=schema_names)
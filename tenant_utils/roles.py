@@ -0,0 +1,163 @@
+"""Defines role templates, named sets of groups and permissions for tenant users."""
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+from . import get_tenant_user_model
+from .cache import get_tenant_cache_alias
+from .exceptions import RoleDoesNotExist
+
+
+# Group and permission ids resolved per schema, see `resolve_role_template`
+ROLE_CACHE_KEY_PREFIX = 'tenant_utils.roles:'
+
+
+def get_role_cache_timeout():
+    return getattr(settings, 'TENANT_ROLE_CACHE_TIMEOUT', 3600)
+
+
+def _make_role_cache_key(schema_name):
+    return ROLE_CACHE_KEY_PREFIX + schema_name
+
+
+class RoleTemplate(object):
+    """
+    A named set of group names and `app_label.codename` permissions.
+    """
+
+    def __init__(self, name, groups=(), permissions=()):
+        self.name = name
+        self.groups = tuple(groups)
+        self.permissions = tuple(permissions)
+
+    def __repr__(self):
+        return '<RoleTemplate: {}>'.format(self.name)
+
+
+def get_role_templates():
+    """
+    Return the role templates configured by `TENANT_ROLE_TEMPLATES`, e.g.::
+
+        TENANT_ROLE_TEMPLATES = {
+            'editor': {
+                'groups': ['Editors'],
+                'permissions': ['blog.add_post', 'blog.change_post'],
+            },
+        }
+    """
+    return {
+        name: RoleTemplate(name, **options)
+        for name, options in getattr(settings, 'TENANT_ROLE_TEMPLATES', {}).items()
+    }
+
+
+def get_role_template(role):
+    """
+    Return the role template for a template name or instance, raises
+    ImproperlyConfigured when `TENANT_ROLE_TEMPLATES` has no such template.
+    """
+    if isinstance(role, RoleTemplate):
+        return role
+    try:
+        return get_role_templates()[role]
+    except KeyError:
+        raise ImproperlyConfigured("Role template does not exist: {}".format(role))
+
+
+def _load_ids(groups, permissions):
+    group_ids = dict(Group.objects.filter(name__in=groups).values_list('name', 'id'))
+    permission_ids = {}
+    codenames = {permission.split('.', 1)[-1] for permission in permissions}
+    for app_label, codename, pk in Permission.objects.filter(
+            codename__in=codenames).values_list('content_type__app_label', 'codename', 'id'):
+        permission_ids['{}.{}'.format(app_label, codename)] = pk
+    return group_ids, permission_ids
+
+
+def resolve_role_template(role):
+    """
+    Return the group ids and permission ids of the role template in the
+    current schema, raises RoleDoesNotExist when one of its groups or
+    permissions doesn't exist there.
+
+    The ids of all configured templates are loaded with one query for groups
+    and one for permissions the first time a schema needs them. They are kept
+    in the shared django cache, so changing groups or running migrations in
+    any process invalidates them for all of them.
+    """
+    role = get_role_template(role)
+    schema_name = connection.schema_name
+    cache = caches[get_tenant_cache_alias()]
+    key = _make_role_cache_key(schema_name)
+    ids = cache.get(key)
+    if ids is None:
+        templates = list(get_role_templates().values())
+        ids = _load_ids(
+            {group for template in templates for group in template.groups},
+            {permission for template in templates for permission in template.permissions})
+        cache.set(key, ids, get_role_cache_timeout())
+    group_ids, permission_ids = ids
+
+    # Templates that aren't configured in the settings are not cached
+    missing_groups = set(role.groups) - set(group_ids)
+    missing_permissions = set(role.permissions) - set(permission_ids)
+    if missing_groups or missing_permissions:
+        new_group_ids, new_permission_ids = _load_ids(missing_groups, missing_permissions)
+        group_ids = dict(group_ids)
+        group_ids.update(new_group_ids)
+        permission_ids = dict(permission_ids)
+        permission_ids.update(new_permission_ids)
+
+    try:
+        return ([group_ids[group] for group in role.groups],
+                [permission_ids[permission] for permission in role.permissions])
+    except KeyError as e:
+        raise RoleDoesNotExist("Role template {} refers to {} which does not exist "
+                               "in schema {}".format(role.name, e, schema_name))
+
+
+def clear_role_cache(sender=None, **kwargs):
+    """
+    Forget the ids resolved for the current schema, connected to group
+    changes and migrations.
+    """
+    cache = caches[get_tenant_cache_alias()]
+    key = _make_role_cache_key(connection.schema_name)
+    cache.delete(key)
+    # Other processes may cache the old ids again before the commit
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _bulk_add(tenant_users, field_name, related_ids):
+    field = get_tenant_user_model()._meta.get_field(field_name)
+    through = field.remote_field.through
+    user_attname = through._meta.get_field(field.m2m_field_name()).attname
+    related_attname = through._meta.get_field(field.m2m_reverse_field_name()).attname
+
+    # Skip the rows users already have, they would violate the unique constraint
+    existing = set(through._default_manager.filter(**{
+        user_attname + '__in': [tenant_user.pk for tenant_user in tenant_users],
+        related_attname + '__in': related_ids,
+    }).values_list(user_attname, related_attname))
+    through._default_manager.bulk_create([
+        through(**{user_attname: tenant_user.pk, related_attname: related_id})
+        for tenant_user in tenant_users
+        for related_id in related_ids
+        if (tenant_user.pk, related_id) not in existing
+    ])
+
+
+def apply_role_template(tenant_users, role):
+    """
+    Add the groups and permissions of the role template to the tenant users
+    of the current schema, with one `bulk_create` per relation. Groups and
+    permissions a user already has are skipped.
+    """
+    group_ids, permission_ids = resolve_role_template(role)
+    tenant_users = list(tenant_users)
+    if group_ids:
+        _bulk_add(tenant_users, 'groups', group_ids)
+    if permission_ids:
+        _bulk_add(tenant_users, 'user_permissions', permission_ids)
@@ -0,0 +1,134 @@
+"""Defines read replica routing for tenant authentication and membership reads."""
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_tenants.utils import get_tenant_model
+
+from . import get_tenant_user_model
+
+
+_state = threading.local()
+
+
+def get_tenant_replica_alias():
+    return getattr(settings, 'TENANT_REPLICA_DB_ALIAS', 'replica')
+
+
+def get_tenant_primary_alias():
+    return getattr(settings, 'TENANT_PRIMARY_DB_ALIAS', DEFAULT_DB_ALIAS)
+
+
+@lru_cache(maxsize=None)
+def get_replica_models():
+    """
+    Return the models whose reads are sent to the replica.
+
+    These are the models read by `TenantModelBackend.get_user`, `get_tenant_user`,
+    `TenantBase._check_user_exists` and `user.tenants.all()`.
+    """
+    from django.contrib.auth import get_user_model
+
+    TenantModel = get_tenant_model()
+    return frozenset({
+        get_tenant_user_model(),
+        get_user_model(),
+        TenantModel,
+        TenantModel.users.through,
+    })
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+def pin_to_primary():
+    """
+    Send every following read of the current thread to the primary.
+    """
+    _state.pinned = True
+
+
+def unpin():
+    _state.pinned = False
+
+
+@contextmanager
+def primary_pinned():
+    """
+    Context manager pinning the reads inside it to the primary.
+    """
+    pinned = is_pinned()
+    pin_to_primary()
+    try:
+        yield
+    finally:
+        _state.pinned = pinned
+
+
+def get_replica_connection():
+    """
+    Return the replica connection with the search_path of the primary connection.
+
+    django_tenants keeps the schema per connection, so the schema set on the
+    primary by the tenant middleware has to be copied to the replica connection.
+    """
+    primary = connections[get_tenant_primary_alias()]
+    replica = connections[get_tenant_replica_alias()]
+    include_public = getattr(primary, 'include_public_schema', True)
+    if (getattr(replica, 'schema_name', None) != primary.schema_name or
+            getattr(replica, 'include_public_schema', True) != include_public):
+        # set_schema() clears the content type cache, only call it when needed
+        replica.set_tenant(primary.tenant, include_public)
+    return replica
+
+
+class TenantReplicaRouter(object):
+    """
+    Routes reads of the tenant auth and membership models to the replica.
+
+    Reads go to the primary once the thread has written anything, or while the
+    primary is inside a transaction, so a request always reads its own writes.
+    Use together with `ReplicaPinningMiddleware` which resets the pinning for
+    every request. Both aliases must use the django_tenants backend, e.g.::
+
+        DATABASES = {
+            'default': {'ENGINE': 'django_tenants.postgresql_backend', 'NAME': 'app'},
+            'replica': {'ENGINE': 'django_tenants.postgresql_backend', 'NAME': 'app_replica'},
+        }
+        DATABASE_ROUTERS = (
+            'tenant_utils.routers.TenantReplicaRouter',
+            'django_tenants.routers.TenantSyncRouter',
+        )
+    """
+
+    def db_for_read(self, model, **hints):
+        if model not in get_replica_models():
+            return None
+        if is_pinned() or connections[get_tenant_primary_alias()].in_atomic_block:
+            return get_tenant_primary_alias()
+        return get_replica_connection().alias
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        instance = hints.get('instance')
+        # Writes of instances read from the replica, e.g. `user.groups.add()`,
+        # would otherwise follow the instance to the replica
+        if (model in get_replica_models() or instance is not None and
+                instance._state.db == get_tenant_replica_alias()):
+            return get_tenant_primary_alias()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {get_tenant_primary_alias(), get_tenant_replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == get_tenant_replica_alias():
+            return False
+        return None
@@ -0,0 +1,132 @@
+"""
+Session engine partitioned by tenant schema.
+
+Set `SESSION_ENGINE = 'tenant_utils.sessions'` to use it. Sessions are written
+through the cache to the `TenantSession` table together with the schema they
+were created in, and are only loaded from that schema.
+"""
+import logging
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django.core.exceptions import SuspiciousOperation
+from django.db import connection, router, transaction
+from django.utils import timezone
+
+from .utils import get_tenant_schema_session_key
+
+
+KEY_PREFIX = 'tenant_utils.sessions'
+
+# Number of sessions expired per query and cache call
+EXPIRE_BATCH_SIZE = 1000
+
+
+class SessionStore(CachedDBStore):
+    """
+    Implements a cached, database backed session store whose sessions are
+    partitioned by the tenant schema of the connection.
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None, tenant_schema=None):
+        self.tenant_schema = tenant_schema or connection.schema_name
+        super().__init__(session_key)
+
+    @classmethod
+    def get_model_class(cls):
+        from .models import TenantSession
+        return TenantSession
+
+    @classmethod
+    def make_cache_key(cls, tenant_schema, session_key):
+        return '{}:{}:{}'.format(cls.cache_key_prefix, tenant_schema, session_key)
+
+    @property
+    def cache_key(self):
+        return self.make_cache_key(self.tenant_schema, self._get_or_create_session_key())
+
+    def _get_session_from_db(self):
+        try:
+            return self.model.objects.get(
+                session_key=self.session_key,
+                tenant_schema=self.tenant_schema,
+                expire_date__gt=timezone.now()
+            )
+        except (self.model.DoesNotExist, SuspiciousOperation) as e:
+            if isinstance(e, SuspiciousOperation):
+                logger = logging.getLogger('django.security.%s' % e.__class__.__name__)
+                logger.warning(str(e))
+            self._session_key = None
+
+    def load(self):
+        data = super().load()
+        if data and data.get(get_tenant_schema_session_key()) != self.tenant_schema:
+            # Never hand out a session created for another tenant
+            self._session_key = None
+            return {}
+        return data
+
+    def exists(self, session_key):
+        return bool(session_key) and (
+            self.make_cache_key(self.tenant_schema, session_key) in self._cache or
+            DBStore.exists(self, session_key)
+        )
+
+    def create_model_instance(self, data):
+        data[get_tenant_schema_session_key()] = self.tenant_schema
+        obj = super().create_model_instance(data)
+        obj.tenant_schema = self.tenant_schema
+        obj.user_id = str(data.get(SESSION_KEY, ''))
+        return obj
+
+    def delete(self, session_key=None):
+        DBStore.delete(self, session_key)
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._cache.delete(self.make_cache_key(self.tenant_schema, session_key))
+
+    @classmethod
+    def expire_sessions(cls, tenant_schema, user_id=None):
+        """
+        Delete all sessions of the tenant schema, or only those of the user
+        with `user_id` inside it, from both the database and the cache.
+        """
+        model = cls.get_model_class()
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        sessions = model.objects.filter(tenant_schema=tenant_schema)
+        if user_id is not None:
+            sessions = sessions.filter(user_id=str(user_id))
+
+        session_keys = list(sessions.values_list('session_key', flat=True))
+        cache_keys = [cls.make_cache_key(tenant_schema, session_key)
+                      for session_key in session_keys]
+        for i in range(0, len(session_keys), EXPIRE_BATCH_SIZE):
+            model.objects.filter(
+                session_key__in=session_keys[i:i + EXPIRE_BATCH_SIZE]).delete()
+
+        def delete_cache_keys():
+            for i in range(0, len(cache_keys), EXPIRE_BATCH_SIZE):
+                cache.delete_many(cache_keys[i:i + EXPIRE_BATCH_SIZE])
+
+        # Until the deletes are committed other requests still see the rows and
+        # would cache them again, so only clear the cache after the commit
+        transaction.on_commit(delete_cache_keys,
+                              using=router.db_for_write(model))
+
+
+def expire_sessions(tenant_schema, user_id=None):
+    """
+    Expire the sessions of a tenant or of one of its users, when the configured
+    session engine supports it.
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    expire = getattr(engine.SessionStore, 'expire_sessions', None)
+    if expire is not None:
+        expire(tenant_schema, user_id)
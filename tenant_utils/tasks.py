@@ -1,5 +1,3 @@
-import time
-
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
@@ -11,12 +9,15 @@ from django_tenants.utils import (
 
 from . import get_tenant_user_model
 from .exceptions import InactiveError, ExistsError
+from .utils import generate_schema_name
 
 
-def provision_tenant(tenant_name, tenant_slug, user_email, is_staff=False):
+def provision_tenant(tenant_name, tenant_slug, user_email, is_staff=False, role=None):
     """
     Create a tenant with default roles and permissions
 
+    The owner gets the groups and permissions of the `role` template if given.
+
     Returns:
     The Fully Qualified Domain Name(FQDN) for the tenant.
     """
@@ -34,12 +35,9 @@ def provision_tenant(tenant_name, tenant_slug, user_email, is_staff=False):
     if get_tenant_domain_model().objects.filter(domain=tenant_domain).first():
         raise ExistsError("Tenant URL already exists.")
 
-    time_string = str(int(time.time()))
-    # Must be valid postgres schema characters see:
-    # https://www.postgresql.org/docs/9.2/static/sql-syntax-lexical.html#SQL-SYNTAX-IDENTIFIERS
     # We generate unique schema names each time so we can keep tenants around without
     # taking up url/schema namespace.
-    schema_name = '{}_{}'.format(tenant_slug, time_string)
+    schema_name = generate_schema_name(tenant_slug)
     domain = None
 
     # noinspection PyBroadException
@@ -57,7 +55,7 @@ def provision_tenant(tenant_name, tenant_slug, user_email, is_staff=False):
                                                               tenant=tenant,
                                                               is_primary=True)
             # Add user as a superuser inside the tenant
-            tenant.add_user(user, is_superuser=True, is_staff=is_staff)
+            tenant.add_user(user, is_superuser=True, is_staff=is_staff, role=role)
     except:  # noqa
         if domain is not None:
             domain.delete()
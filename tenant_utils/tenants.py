@@ -15,7 +15,9 @@ from .signals import (
     tenant_user_connected,
     tenant_user_disconnected
 )
-from .utils import schema_required
+from .roles import apply_role_template
+from .sessions import expire_sessions
+from .utils import schema_required, get_unique_id, add_unique_suffix
 from .exceptions import InactiveError, ExistsError, DeleteError, SchemaError
 
 
@@ -31,6 +33,8 @@ class TenantBase(TenantMixin):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created = models.DateTimeField()
     modified = models.DateTimeField(blank=True)
+    # Set by delete_tenant(), retired tenants can be archived and dropped
+    retired = models.DateTimeField(null=True, blank=True)
 
     # Schema will be automatically created and synced when it is saved
     auto_create_schema = True
@@ -154,9 +158,12 @@ class TenantBase(TenantMixin):
 
     @schema_required
     @transaction.atomic
-    def add_user(self, user_obj, is_superuser=False, is_staff=False):
+    def add_user(self, user_obj, is_superuser=False, is_staff=False, role=None):
         """
         Create a user inside the tenant and set its supervisor to the public user.
+
+        If `role` is given, the groups and permissions of that role template
+        are added to the tenant user.
         """
         if self.schema_name == get_public_schema_name():
             raise SchemaError(
@@ -168,14 +175,22 @@ class TenantBase(TenantMixin):
 
         # Create a user in the tenant with generated username and email
         # And link it to the public user
-        time_string = str(int(time.time()))
-        tenant_user = get_tenant_user_model().objects.create(
-            email='{}_{}'.format(user_obj.email, time_string),
-            username='{}_{}'.format(user_obj.username, time_string),
+        TenantUserModel = get_tenant_user_model()
+        unique_id = get_unique_id()
+        tenant_user = TenantUserModel.objects.create(
+            email=add_unique_suffix(
+                user_obj.email, unique_id,
+                TenantUserModel._meta.get_field('email').max_length),
+            username=add_unique_suffix(
+                user_obj.username, unique_id,
+                TenantUserModel._meta.get_field('username').max_length),
             supervisor=user_obj,
             is_superuser=is_superuser, is_staff=is_staff,
             is_verified=True)
 
+        if role is not None:
+            apply_role_template([tenant_user], role)
+
         # Link user to tenant
         self._link_to_tenant_user(user_obj, tenant_user)
 
@@ -188,7 +203,8 @@ class TenantBase(TenantMixin):
         Remove the related public user from the tenant.
 
         If `soft_remove` is set to False, then cleanup the permissions of the tenant
-        user and set its `is_active` status to False.
+        user and set its `is_active` status to False. The sessions of the tenant
+        user are expired either way.
         """
         if self.schema_name == get_public_schema_name():
             raise SchemaError(
@@ -220,6 +236,8 @@ class TenantBase(TenantMixin):
                 # Set the status of this tenant user to inactive
                 tenant_user.is_active = False
             tenant_user.save()
+            # Log the tenant user out everywhere, it has no supervisor anymore
+            expire_sessions(self.schema_name, tenant_user.pk)
 
         self._unlink_from_tenant(user_obj)
 
@@ -239,7 +257,11 @@ class TenantBase(TenantMixin):
             raise ValueError("Cannot delete public tenant schema")
 
         for user_obj in self.users.all():
-            self.remove_user(user_obj)
+            # The owner is removed by transfer_ownership
+            if user_obj.id != self.owner_id:
+                self.remove_user(user_obj)
+
+        expire_sessions(self.schema_name)
 
         # Seconds since epoch, time() returns a float, so we convert to
         # an int first to truncate the decimal portion
@@ -259,6 +281,10 @@ class TenantBase(TenantMixin):
         # Transfer ownership to system
         self.transfer_ownership(public_tenant.owner)
 
+        # Mark the tenant as retired, its schema may be archived from now on
+        self.retired = timezone.now()
+        self.save(update_fields=['retired'])
+
     @transaction.atomic
     def transfer_ownership(self, new_owner):
         old_owner = self.owner
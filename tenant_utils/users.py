@@ -5,11 +5,13 @@ from django.db import connection
 
 from django_tenants.utils import get_public_schema_name, get_tenant_model
 
+from .prefetch import PublicUserQuerySet
+from .sessions import expire_sessions
 from .signals import tenant_user_created, tenant_user_deleted
 from .exceptions import SchemaError, ExistsError, DeleteError, InactiveError
 
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(PublicUserQuerySet)):
     use_in_migrations = True
 
     def _create_user(self, username, email, password, **extra_fields):
@@ -104,4 +106,6 @@ class UserManager(BaseUserManager):
         user_obj.is_active = False
         user_obj.save()
 
+        expire_sessions(get_public_schema_name(), user_obj.pk)
+
         tenant_user_deleted.send(sender=self.__class__, user=user_obj)
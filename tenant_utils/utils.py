@@ -1,10 +1,15 @@
 """Defines utility functions for multi tenant user environments."""
+import re
+import time
+
 from django.apps import apps
 from django.conf import settings
 from django.db import connection, transaction
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
 from django.core.exceptions import ImproperlyConfigured
+from django.utils.crypto import get_random_string
+from django.utils.module_loading import import_string
 
 from django_tenants.utils import (
     get_tenant_model,
@@ -20,6 +25,84 @@ def get_tenant_schema_session_key():
                    '_tenant_schema_name')
 
 
+# Postgres truncates identifiers longer than NAMEDATALEN - 1 bytes
+MAX_SCHEMA_NAME_LENGTH = 63
+
+# Leaves room for a readable slug prefix in schema names
+MAX_UNIQUE_ID_LENGTH = 32
+
+UNIQUE_ID_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def _to_base36(number):
+    digits = []
+    while number:
+        number, remainder = divmod(number, 36)
+        digits.append(UNIQUE_ID_CHARS[remainder])
+    return ''.join(reversed(digits)) or '0'
+
+
+def generate_unique_id():
+    """
+    Return a time ordered identifier with a random component.
+
+    The first part is the current time in milliseconds and the second part
+    is random, so ids generated in the same millisecond still differ. Only
+    lowercase letters and digits are used, which keeps the id valid inside
+    postgres identifiers, usernames and emails.
+    """
+    return '{}{}'.format(_to_base36(int(time.time() * 1000)),
+                         get_random_string(8, UNIQUE_ID_CHARS))
+
+
+def get_unique_id():
+    """
+    Return a new identifier from the generator configured by
+    `TENANT_UNIQUE_ID_GENERATOR`, defaults to `generate_unique_id`.
+
+    The id is lowercased, stripped of anything but letters and digits and
+    capped at `MAX_UNIQUE_ID_LENGTH` characters, e.g. an `uuid4()` becomes
+    its 32 hex digits.
+    """
+    generator = getattr(settings, 'TENANT_UNIQUE_ID_GENERATOR', None)
+    if generator is None:
+        return generate_unique_id()
+    if isinstance(generator, str):
+        generator = import_string(generator)
+    unique_id = re.sub(r'[^a-z0-9]', '', str(generator()).lower())
+    if not unique_id:
+        raise ImproperlyConfigured(
+            "TENANT_UNIQUE_ID_GENERATOR must return letters or digits")
+    return unique_id[:MAX_UNIQUE_ID_LENGTH]
+
+
+def add_unique_suffix(value, unique_id, max_length=None):
+    """
+    Return `<value>_<unique_id>`, with value truncated so the result fits
+    into `max_length` characters.
+    """
+    if max_length:
+        value = value[:max(max_length - len(unique_id) - 1, 0)]
+    return '{}_{}'.format(value, unique_id)
+
+
+def generate_schema_name(tenant_slug):
+    """
+    Build a unique schema name for the tenant slug.
+
+    Must be valid postgres schema characters see:
+    https://www.postgresql.org/docs/9.2/static/sql-syntax-lexical.html#SQL-SYNTAX-IDENTIFIERS
+    The slug is truncated so the result fits into the identifier length limit.
+    """
+    unique_id = get_unique_id()
+    prefix = re.sub(r'[^a-z0-9_]', '_', tenant_slug.lower())
+    # Identifiers must not start with a digit and `pg_` is reserved
+    if not re.match(r'^[a-z_]', prefix) or prefix.startswith('pg_'):
+        prefix = 't' + prefix
+    prefix = prefix[:MAX_SCHEMA_NAME_LENGTH - len(unique_id) - 1]
+    return '{}_{}'.format(prefix, unique_id)
+
+
 def schema_required(func):
     def inner(self, *args, **options):
         tenant_schema = self.schema_name
@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+
+from django_tenants.utils import get_public_schema_name, get_tenant_model
+
+from tenant_utils.utils import create_public_tenant
+
+
+POSTGRES_CONFIGURED = bool(os.environ.get('TENANT_UTILS_TEST_PRIMARY_DB'))
+
+
+@unittest.skipUnless(POSTGRES_CONFIGURED,
+                     "Needs a PostgreSQL database, see tests/settings.py")
+@override_settings(DATABASE_ROUTERS=['django_tenants.routers.TenantSyncRouter'])
+class PostgresTestCase(TransactionTestCase):
+    """
+    Runs against a test database created on the configured PostgreSQL server,
+    with a public tenant in place.
+    """
+    # Keep the test runner from creating databases when the tests are skipped
+    databases = {'default'} if POSTGRES_CONFIGURED else set()
+
+    def setUp(self):
+        connection.set_schema_to_public()
+        create_public_tenant('example.com', 'system', 'system@example.com')
+
+    def tearDown(self):
+        connection.set_schema_to_public()
+        # Tenant tables reference the public ones, the flush can only truncate
+        # those once the tenant schemas are gone
+        with connection.cursor() as cursor:
+            for tenant in get_tenant_model().objects.exclude(
+                    schema_name=get_public_schema_name()):
+                cursor.execute('DROP SCHEMA IF EXISTS {} CASCADE'.format(
+                    connection.ops.quote_name(tenant.schema_name)))
+
+    def create_user(self, username):
+        return get_user_model().objects.create(
+            username=username, email='{}@example.com'.format(username))
@@ -0,0 +1,51 @@
+import os
+
+SECRET_KEY = 'tenant-utils-tests'
+
+SHARED_APPS = [
+    'django_tenants',
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'tenant_utils',
+    'tests.testapp',
+]
+
+# Tenants and public users only live in the public schema, tenant users
+# point at them across the schemas
+TENANT_APPS = [
+    'django.contrib.contenttypes',
+    'tests.tenantapp',
+]
+
+INSTALLED_APPS = SHARED_APPS + ['tests.tenantapp']
+
+TENANT_MODEL = 'testapp.Tenant'
+TENANT_DOMAIN_MODEL = 'testapp.Domain'
+TENANT_USER_MODEL = 'tenantapp.TenantUser'
+PUBLIC_USER_MODEL = 'auth.User'
+
+DATABASE_ROUTERS = [
+    'tenant_utils.routers.TenantReplicaRouter',
+    'django_tenants.routers.TenantSyncRouter',
+]
+
+
+def database(name):
+    return {
+        'ENGINE': 'django_tenants.postgresql_backend',
+        'NAME': name,
+        'USER': os.environ.get('TENANT_UTILS_TEST_DB_USER', ''),
+        'PASSWORD': os.environ.get('TENANT_UTILS_TEST_DB_PASSWORD', ''),
+        'HOST': os.environ.get('TENANT_UTILS_TEST_DB_HOST', ''),
+    }
+
+
+# Only the router tests connect, they need two local PostgreSQL databases, e.g.
+# TENANT_UTILS_TEST_PRIMARY_DB=tenant_utils TENANT_UTILS_TEST_REPLICA_DB=tenant_utils_replica
+DATABASES = {
+    'default': database(os.environ.get('TENANT_UTILS_TEST_PRIMARY_DB', 'tenant_utils')),
+}
+if os.environ.get('TENANT_UTILS_TEST_REPLICA_DB'):
+    DATABASES['replica'] = database(os.environ['TENANT_UTILS_TEST_REPLICA_DB'])
+
+TENANT_USERS_DOMAIN = 'example.com'
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
+from django.contrib.auth.models import PermissionsMixin
+from django.db import models
+
+from tenant_utils.prefetch import TenantUserQuerySet
+
+
+class TenantUser(AbstractBaseUser, PermissionsMixin):
+    username = models.CharField(max_length=150, unique=True)
+    email = models.EmailField(blank=True)
+    is_staff = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    is_verified = models.BooleanField(default=False)
+    # Points to the public schema, resolved through the search_path
+    supervisor = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
+                                   related_name='supervised_tenant_users',
+                                   on_delete=models.SET_NULL)
+
+    # Only the public schema has the auth tables, related names must not clash
+    # with the public user
+    groups = models.ManyToManyField('auth.Group', blank=True,
+                                    related_name='tenant_users')
+    user_permissions = models.ManyToManyField('auth.Permission', blank=True,
+                                              related_name='tenant_users')
+
+    objects = BaseUserManager.from_queryset(TenantUserQuerySet)()
+
+    USERNAME_FIELD = 'username'
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+
+from django_tenants.utils import get_tenant_model
+
+from tenant_utils.archive import archive_tenant, restore_tenant
+from tenant_utils.tasks import provision_tenant
+
+from .base import PostgresTestCase
+
+
+class ArchiveTests(PostgresTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.tenant = provision_tenant('Tenant', 'tenant', self.create_user('owner').email)
+
+    def schema_exists(self, schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_namespace WHERE nspname = %s', [schema_name])
+            return cursor.fetchone() is not None
+
+    def test_archive_and_restore(self):
+        self.tenant.delete_tenant()
+        schema_name = self.tenant.schema_name
+        archive_tenant(self.tenant, self.output_dir)
+        self.assertFalse(self.schema_exists(schema_name))
+
+        restore_tenant(schema_name, self.output_dir)
+        self.assertTrue(self.schema_exists(schema_name))
+        # Restored tenants are not archived again by the next run
+        self.assertIsNone(get_tenant_model().objects.get(schema_name=schema_name).retired)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_failed_drop_removes_archive(self):
+        self.tenant.delete_tenant()
+        with mock.patch.object(self.tenant, 'delete', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_tenant(self.tenant, self.output_dir)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+        archive_tenant(self.tenant, self.output_dir)
+        self.assertFalse(self.schema_exists(self.tenant.schema_name))
+
+    def test_failed_restore_drops_schema(self):
+        self.tenant.delete_tenant()
+        schema_name = self.tenant.schema_name
+        archive_tenant(self.tenant, self.output_dir)
+
+        with mock.patch('django.core.serializers.deserialize', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                restore_tenant(schema_name, self.output_dir)
+        self.assertFalse(self.schema_exists(schema_name))
+
+        restore_tenant(schema_name, self.output_dir)
+        self.assertTrue(self.schema_exists(schema_name))
+
+    def test_mark_legacy(self):
+        self.tenant.delete_tenant()
+        # Retired before the retired field existed
+        get_tenant_model().objects.filter(pk=self.tenant.pk).update(retired=None)
+
+        call_command('archive_tenants', self.output_dir, mark_legacy=True,
+                     dry_run=True, stdout=open(os.devnull, 'w'))
+        self.assertIsNone(get_tenant_model().objects.get(pk=self.tenant.pk).retired)
+
+        call_command('archive_tenants', self.output_dir, mark_legacy=True,
+                     interactive=False, stdout=open(os.devnull, 'w'))
+        self.assertIsNotNone(get_tenant_model().objects.get(pk=self.tenant.pk).retired)
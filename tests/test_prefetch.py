@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_tenants.utils import schema_context
+
+from tenant_utils import get_tenant_user_model
+from tenant_utils.prefetch import PublicUserQuerySet
+from tenant_utils.tasks import provision_tenant
+
+from .base import PostgresTestCase
+
+
+class CrossSchemaPrefetchTests(PostgresTestCase):
+
+    def setUp(self):
+        super().setUp()
+        owner = self.create_user('owner')
+        self.tenant = provision_tenant('Tenant', 'tenant', owner.email)
+        self.users = [self.create_user('user{}'.format(i)) for i in range(5)]
+        for user in self.users:
+            self.tenant.add_user(user)
+
+    @contextmanager
+    def assertNumSelects(self, num):
+        # django_tenants adds a `SET search_path` whenever the schema changes
+        with CaptureQueriesContext(connection) as context:
+            yield
+        selects = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), num, '\n'.join(selects))
+
+    def test_prefetch_supervisors(self):
+        with schema_context(self.tenant.schema_name):
+            # One query for the tenant users and one for their supervisors
+            with self.assertNumSelects(2):
+                tenant_users = list(
+                    get_tenant_user_model().objects.prefetch_supervisors())
+                supervisors = {tenant_user.supervisor for tenant_user in tenant_users}
+        self.assertEqual(len(tenant_users), len(self.users) + 1)
+        self.assertTrue(set(self.users) <= supervisors)
+
+    def test_prefetch_tenant_users(self):
+        queryset = PublicUserQuerySet(get_user_model()).filter(
+            pk__in=[user.pk for user in self.users])
+        with schema_context(self.tenant.schema_name):
+            # One query for the public users and one for their tenant users
+            with self.assertNumSelects(2):
+                users = list(queryset.prefetch_tenant_users())
+                tenant_users = [user.tenant_user for user in users]
+                supervisors = [tenant_user.supervisor for tenant_user in tenant_users]
+        self.assertEqual(len(users), len(self.users))
+        self.assertEqual(supervisors, users)
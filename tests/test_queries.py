@@ -0,0 +1,30 @@
+from django.db import connection
+
+from tenant_utils.queries import count_tenant_users
+from tenant_utils.tasks import provision_tenant
+
+from .base import PostgresTestCase
+
+
+class CrossSchemaQueryTests(PostgresTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tenants = [provision_tenant('Tenant {}'.format(i), 'tenant{}'.format(i),
+                                         self.create_user('owner{}'.format(i)).email)
+                        for i in range(2)]
+        self.tenants[0].add_user(self.create_user('user'))
+
+    def test_count_tenant_users(self):
+        self.assertEqual(count_tenant_users(), {
+            self.tenants[0].schema_name: 2,
+            self.tenants[1].schema_name: 1,
+        })
+
+    def test_without_server_side_cursors(self):
+        connection.settings_dict['DISABLE_SERVER_SIDE_CURSORS'] = True
+        self.addCleanup(connection.settings_dict.pop, 'DISABLE_SERVER_SIDE_CURSORS')
+        self.assertEqual(count_tenant_users(is_superuser=True), {
+            self.tenants[0].schema_name: 1,
+            self.tenants[1].schema_name: 1,
+        })
@@ -0,0 +1,68 @@
+import unittest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from tenant_utils import get_tenant_user_model
+from tenant_utils.middleware import ReplicaPinningMiddleware
+from tenant_utils.routers import TenantReplicaRouter, is_pinned, unpin
+
+
+# Plain unittest cases, so the test runner doesn't create test databases.
+# Nothing is written, the queries only inspect the connection state.
+@unittest.skipUnless('replica' in settings.DATABASES,
+                     "Needs two PostgreSQL databases, see tests/settings.py")
+class TenantReplicaRouterTests(unittest.TestCase):
+
+    def setUp(self):
+        unpin()
+        self.router = TenantReplicaRouter()
+        self.primary = connections['default']
+        self.primary.set_schema_to_public()
+
+    def tearDown(self):
+        unpin()
+        self.primary.set_schema_to_public()
+
+    def search_path(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SHOW search_path')
+            return cursor.fetchone()[0]
+
+    def test_reads_go_to_replica_with_primary_schema(self):
+        self.primary.set_schema('tenant_a')
+        self.assertEqual(self.router.db_for_read(get_tenant_user_model()), 'replica')
+        self.assertEqual(self.search_path('replica'), self.search_path('default'))
+        self.assertIn('tenant_a', self.search_path('replica'))
+
+    def test_other_models_are_not_routed(self):
+        self.assertIsNone(self.router.db_for_read(Group))
+        self.assertIsNone(self.router.db_for_write(Group))
+
+    def test_writes_of_replica_instances_go_to_primary(self):
+        user = get_user_model()(pk=1)
+        user._state.db = 'replica'
+        self.assertEqual(self.router.db_for_write(Group, instance=user), 'default')
+        self.assertEqual(
+            self.router.db_for_write(get_user_model().groups.through, instance=user),
+            'default')
+
+    def test_write_pins_to_primary(self):
+        self.router.db_for_write(Group)
+        self.assertTrue(is_pinned())
+        self.assertEqual(self.router.db_for_read(get_tenant_user_model()), 'default')
+
+    def test_reads_in_transaction_use_primary(self):
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(get_tenant_user_model()),
+                             'default')
+
+    def test_middleware_resets_pinning(self):
+        self.router.db_for_write(Group)
+        middleware = ReplicaPinningMiddleware(lambda request: HttpResponse())
+        middleware(RequestFactory().get('/'))
+        self.assertFalse(is_pinned())
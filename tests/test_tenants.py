@@ -0,0 +1,57 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from django_tenants.utils import schema_context
+
+from tenant_utils import get_tenant_user_model
+from tenant_utils.tasks import provision_tenant
+
+from .base import PostgresTestCase
+
+
+class ConcurrentProvisioningTests(PostgresTestCase):
+
+    def run_concurrently(self, func, items, workers=8):
+        def run(item):
+            try:
+                return func(item)
+            finally:
+                # Every thread opens its own connection
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+
+    def test_concurrent_provision_tenant(self):
+        # The slugs only differ past the part kept in the schema name, so all
+        # schema names share one prefix and rely on the unique id alone
+        owners = [self.create_user('owner{}'.format(i)) for i in range(6)]
+        tenants = self.run_concurrently(
+            lambda i: provision_tenant('Tenant {}'.format(i),
+                                       'acme' * 11 + 'x' + str(i), owners[i].email),
+            range(len(owners)))
+
+        schema_names = [tenant.schema_name for tenant in tenants]
+        self.assertEqual(len(set(schema_names)), len(schema_names))
+        for schema_name in schema_names:
+            self.assertRegex(schema_name, re.compile(r'^[a-z_][a-z0-9_]{0,62}$'))
+            with schema_context(schema_name):
+                self.assertEqual(get_tenant_user_model().objects.count(), 1)
+
+    def test_concurrent_add_user(self):
+        owner = self.create_user('owner')
+        tenant = provision_tenant('Tenant', 'tenant', owner.email)
+        # Long usernames must still fit the tenant user's username column
+        users = [self.create_user('{}{}'.format('u' * 140, i)) for i in range(40)]
+
+        self.run_concurrently(tenant.add_user, users)
+
+        with schema_context(tenant.schema_name):
+            tenant_users = get_tenant_user_model().objects.filter(
+                supervisor__in=users)
+            usernames = [tenant_user.username for tenant_user in tenant_users]
+        self.assertEqual(len(usernames), len(users))
+        self.assertEqual(len(set(usernames)), len(users))
+        self.assertEqual(tenant.users.count(), len(users) + 1)
@@ -0,0 +1,60 @@
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase, override_settings
+
+from tenant_utils.utils import (
+    MAX_SCHEMA_NAME_LENGTH,
+    generate_schema_name,
+    get_unique_id
+)
+
+
+SCHEMA_NAME_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+def uuid_generator():
+    return uuid.uuid4()
+
+
+def long_generator():
+    return 'X-' * 60
+
+
+class UniqueIdTests(SimpleTestCase):
+
+    def generate_concurrently(self, func, count=20000, workers=16):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda i: func(), range(count)))
+
+    def assertValidSchemaName(self, schema_name):
+        self.assertRegex(schema_name, SCHEMA_NAME_RE)
+        self.assertLessEqual(len(schema_name), MAX_SCHEMA_NAME_LENGTH)
+        self.assertFalse(schema_name.startswith('pg_'))
+
+    def test_concurrent_unique_ids(self):
+        ids = self.generate_concurrently(get_unique_id)
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_concurrent_schema_names(self):
+        names = self.generate_concurrently(lambda: generate_schema_name('acme'))
+        self.assertEqual(len(set(names)), len(names))
+        for name in names:
+            self.assertValidSchemaName(name)
+
+    def test_schema_name_from_awkward_slugs(self):
+        for slug in ['', '9lives', 'pg_tenant', 'Big-Corp', 'x' * 100]:
+            self.assertValidSchemaName(generate_schema_name(slug))
+
+    @override_settings(TENANT_UNIQUE_ID_GENERATOR='tests.test_utils.uuid_generator')
+    def test_custom_generator_is_sanitised(self):
+        names = self.generate_concurrently(lambda: generate_schema_name('acme'),
+                                           count=2000)
+        self.assertEqual(len(set(names)), len(names))
+        for name in names:
+            self.assertValidSchemaName(name)
+
+    @override_settings(TENANT_UNIQUE_ID_GENERATOR='tests.test_utils.long_generator')
+    def test_custom_generator_is_capped(self):
+        self.assertValidSchemaName(generate_schema_name('x' * 100))
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import models
+
+from django_tenants.models import DomainMixin
+
+from tenant_utils.tenants import TenantBase, TenantUserMixin
+
+
+class Tenant(TenantBase, TenantUserMixin):
+    name = models.CharField(max_length=100)
+    users = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        blank=True,
+        related_name='tenants',
+        through='Membership',
+        through_fields=('tenant', 'user')
+    )
+
+
+class Membership(models.Model):
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    organization_user = models.IntegerField()
+
+
+class Domain(DomainMixin):
+    pass